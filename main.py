@@ -1,17 +1,34 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, Date, ForeignKey
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi_cache import FastAPICache, JsonCoder
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect, Column, Integer, String, Date, ForeignKey, Index, CheckConstraint, func, select, insert, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from pydantic import BaseModel, EmailStr, validator
-from typing import List, Optional
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, field_validator
+from emval import EmailValidator
+from typing import List, Literal, Optional
+from contextlib import asynccontextmanager
 from datetime import date
+import logging
 import os
+import uuid
+import orjson
 from dotenv import load_dotenv
 
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database setup with Render compatibility
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hrms.db")
 
@@ -19,16 +36,45 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./hrms.db")
 if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# Use async drivers: aiosqlite for SQLite, asyncpg for PostgreSQL
+if DATABASE_URL.startswith("sqlite://"):
+    DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+elif DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
 SQLALCHEMY_DATABASE_URL = DATABASE_URL
 
+# Response cache and stats counters: Redis when configured, in-process memory / SQL otherwise
+REDIS_URL = os.getenv("REDIS_URL")
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+
+# Keep warm connections in a pool; an in-memory SQLite database must share a single connection
+if ":memory:" in SQLALCHEMY_DATABASE_URL:
+    pool_args = {"poolclass": StaticPool}
+else:
+    pool_args = {"poolclass": AsyncAdaptedQueuePool, "pool_size": 20, "max_overflow": 40, "pool_pre_ping": True}
+
 # Use connect_args only for SQLite
-engine = create_engine(
+engine = create_async_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {},
+    **pool_args
 )
 
+# Tune SQLite for concurrent reads and cheaper commits
+if "sqlite" in SQLALCHEMY_DATABASE_URL:
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.close()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+AsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 # Database Models
@@ -43,39 +89,42 @@ class Employee(Base):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        Index("uq_att_emp_date", "employee_id", "date", unique=True),
+        Index("ix_att_emp_status", "employee_id", "status"),
+        Index("ix_att_status", "status"),
+        CheckConstraint("status IN ('Present', 'Absent')", name="ck_att_status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
     date = Column(Date, nullable=False)
-    status = Column(String, nullable=False)  # "Present" or "Absent"
+    status = Column(String(7), nullable=False)  # "Present" or "Absent"
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Email validation (syntax only, no DNS deliverability lookup)
+email_validator = EmailValidator(deliverable_address=False)
 
 # Pydantic Models
 class EmployeeCreate(BaseModel):
+    # Strip and reject empty strings in pydantic-core
+    model_config = ConfigDict(str_strip_whitespace=True, str_min_length=1)
+    
     employee_id: str
     full_name: str
-    email: EmailStr
+    email: str
     department: str
     
-    @validator('employee_id')
-    def validate_employee_id(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Employee ID cannot be empty')
-        return v.strip()
-    
-    @validator('full_name')
-    def validate_full_name(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Full name cannot be empty')
-        return v.strip()
-    
-    @validator('department')
-    def validate_department(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Department cannot be empty')
-        return v.strip()
+    @field_validator('email')
+    @classmethod
+    def validate_email(cls, v):
+        try:
+            validated = email_validator.validate_email(v)
+        except (SyntaxError, ValueError) as e:
+            raise ValueError(str(e))
+        # emval only rejects dotless domains as part of its deliverability check, which is disabled
+        if "." not in validated.ascii_domain:
+            raise ValueError("The part after the @-sign is not valid. It should have a period.")
+        return validated.normalized
 
 class EmployeeResponse(BaseModel):
     id: int
@@ -90,13 +139,7 @@ class EmployeeResponse(BaseModel):
 class AttendanceCreate(BaseModel):
     employee_id: int
     date: date
-    status: str
-    
-    @validator('status')
-    def validate_status(cls, v):
-        if v not in ['Present', 'Absent']:
-            raise ValueError('Status must be either "Present" or "Absent"')
-        return v
+    status: Literal["Present", "Absent"]
 
 class AttendanceResponse(BaseModel):
     id: int
@@ -109,8 +152,203 @@ class AttendanceResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Build cache keys from the request URL so injected dependencies (e.g. the DB session) are ignored
+def request_key_builder(func, namespace="", *, request=None, response=None, args=(), kwargs=None):
+    return f"{namespace}:{func.__name__}:{request.url.path}?{request.query_params}"
+
+# Cached bodies are already JSON; return them as a response on a hit so FastAPI skips serialization
+class JSONResponseCoder(JsonCoder):
+    @classmethod
+    def decode_as_type(cls, value, *, type_):
+        return Response(content=value, media_type="application/json")
+
+# Called after the database commit, so a cache backend failure is logged instead of failing the request
+async def invalidate_cache(*namespaces):
+    for namespace in namespaces:
+        try:
+            await FastAPICache.clear(namespace=namespace)
+        except RedisError:
+            logger.warning("Could not clear %s cache namespace", namespace, exc_info=True)
+
+# Dashboard counters kept in one Redis hash so /api/stats does not scan the attendance table.
+# Fields: total_employees, total_attendance, total_present, present:<employee id>, plus the
+# "seeded" marker. Increments are only applied while "seeded" is set, so a flushed or evicted
+# hash is never rebuilt from deltas alone; get_stats reseeds it from SQL instead.
+STATS_COUNTERS = "hrms:counters"
+STATS_SEED_TIMEOUT = 30  # seconds an abandoned seeding attempt blocks others
+
+# ARGV: number of (field, delta) pairs, the pairs, then fields to remove.
+# While a seed is in progress, mark it dirty so it does not overwrite this write.
+INCREMENT_COUNTERS_LUA = """
+if redis.call('HEXISTS', KEYS[1], 'seeded') == 0 then
+    if redis.call('HEXISTS', KEYS[1], 'seeding') == 1 then
+        redis.call('HSET', KEYS[1], 'dirty', 1)
+    end
+    return 0
+end
+local npairs = tonumber(ARGV[1])
+for i = 0, npairs - 1 do
+    redis.call('HINCRBY', KEYS[1], ARGV[2 + 2 * i], ARGV[3 + 2 * i])
+end
+for i = 2 + 2 * npairs, #ARGV do
+    redis.call('HDEL', KEYS[1], ARGV[i])
+end
+return 1
+"""
+
+# ARGV: seed token, timeout. Claims the hash for seeding unless it is seeded or being seeded.
+BEGIN_SEED_LUA = """
+if redis.call('HEXISTS', KEYS[1], 'seeded') == 1 or redis.call('HEXISTS', KEYS[1], 'seeding') == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'seeding', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# ARGV: seed token, then (field, value) pairs. Writes the snapshot only if this seed still owns
+# the hash and no write landed while the snapshot was read; otherwise the next read retries.
+COMMIT_SEED_LUA = """
+if redis.call('HGET', KEYS[1], 'seeding') ~= ARGV[1] then
+    return 0
+end
+local dirty = redis.call('HEXISTS', KEYS[1], 'dirty')
+redis.call('DEL', KEYS[1])
+if dirty == 1 then
+    return 0
+end
+for i = 2, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('HSET', KEYS[1], 'seeded', 1)
+return 1
+"""
+
+# Set when this process could not invalidate the counters; the next read retries
+stats_counters_stale = False
+
+async def run_counters_script(lua, *args):
+    return await redis_client.register_script(lua)(keys=[STATS_COUNTERS], args=list(args))
+
+async def reset_stats_counters():
+    global stats_counters_stale
+    try:
+        await redis_client.delete(STATS_COUNTERS)
+        stats_counters_stale = False
+    except RedisError:
+        logger.warning("Could not reset stats counters in Redis", exc_info=True)
+        stats_counters_stale = True
+
+async def seed_stats_counters(db):
+    # Claim the hash before reading SQL so writes committed meanwhile mark the seed dirty
+    token = uuid.uuid4().hex
+    try:
+        claimed = await run_counters_script(BEGIN_SEED_LUA, token, STATS_SEED_TIMEOUT)
+    except RedisError:
+        logger.warning("Could not seed stats counters in Redis", exc_info=True)
+        claimed = False
+    stats = await count_stats(db)
+    if claimed:
+        total_employees, total_attendance, present_count, present_by_employee = stats
+        fields = [
+            "total_employees", total_employees,
+            "total_attendance", total_attendance,
+            "total_present", present_count,
+        ]
+        for emp_id, present_days in present_by_employee.items():
+            fields += [f"present:{emp_id}", present_days]
+        try:
+            await run_counters_script(COMMIT_SEED_LUA, token, *fields)
+        except RedisError:
+            logger.warning("Could not seed stats counters in Redis", exc_info=True)
+    return stats
+
+async def update_stats_counters(employees=0, attendance=0, present_by_employee=None, removed_employee_id=None):
+    if redis_client is None:
+        return
+    present_by_employee = present_by_employee or {}
+    deltas = {
+        "total_employees": employees,
+        "total_attendance": attendance,
+        "total_present": sum(present_by_employee.values()),
+    }
+    for emp_id, present_days in present_by_employee.items():
+        deltas[f"present:{emp_id}"] = present_days
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    removed = [] if removed_employee_id is None else [f"present:{removed_employee_id}"]
+    args = [len(deltas)]
+    for field, delta in deltas.items():
+        args += [field, delta]
+    # The database write is already committed, so a Redis failure must not fail the request
+    try:
+        await run_counters_script(INCREMENT_COUNTERS_LUA, *args, *removed)
+    except RedisError:
+        logger.warning("Could not update stats counters in Redis", exc_info=True)
+        await reset_stats_counters()
+
+async def read_stats_counters():
+    if redis_client is None:
+        return None
+    if stats_counters_stale:
+        await reset_stats_counters()
+        return None
+    try:
+        counters = await redis_client.hgetall(STATS_COUNTERS)
+    except RedisError:
+        logger.warning("Could not read stats counters from Redis", exc_info=True)
+        return None
+    # No marker (evicted, flushed, reset or mid-seed) means the counters must be rebuilt
+    if b"seeded" not in counters:
+        return None
+    present_by_employee = {
+        int(field[len(b"present:"):]): int(value)
+        for field, value in counters.items()
+        if field.startswith(b"present:")
+    }
+    return (
+        int(counters.get(b"total_employees", 0)),
+        int(counters.get(b"total_attendance", 0)),
+        int(counters.get(b"total_present", 0)),
+        present_by_employee,
+    )
+
+# create_all never alters existing tables, so add indexes introduced since the table was created
+def upgrade_schema(conn):
+    existing = {index["name"] for index in inspect(conn).get_indexes(Attendance.__tablename__)}
+    if "uq_att_emp_date" not in existing:
+        # Keep the earliest record of any duplicate (employee_id, date) pair so the unique index can be built
+        result = conn.execute(delete(Attendance).where(Attendance.id.not_in(
+            select(func.min(Attendance.id)).group_by(Attendance.employee_id, Attendance.date)
+        )))
+        if result.rowcount:
+            logger.warning(
+                "Deleted %d duplicate attendance records before creating uq_att_emp_date", result.rowcount
+            )
+    # checkfirst guards against another worker creating the same index concurrently
+    for index in Attendance.__table__.indexes:
+        if index.name not in existing:
+            index.create(conn, checkfirst=True)
+
+# Create tables, set up the response cache and rebuild the stats counters on startup
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+    if redis_client is not None:
+        backend = RedisBackend(redis_client)
+        # The database may have been reset while Redis persisted, so always rebuild
+        await reset_stats_counters()
+        async with AsyncSessionLocal() as db:
+            await seed_stats_counters(db)
+    else:
+        backend = InMemoryBackend()
+    FastAPICache.init(backend, prefix="hrms", key_builder=request_key_builder)
+    yield
+    await engine.dispose()
+
 # FastAPI app
-app = FastAPI(title="HRMS Lite API")
+app = FastAPI(title="HRMS Lite API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -122,32 +360,50 @@ app.add_middleware(
 )
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+# Parse and validate JSON request bodies in one pass with pydantic-core
+def is_json_content_type(content_type):
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or (media_type.startswith("application/") and media_type.endswith("+json"))
+
+def json_body(model, many=False):
+    adapter = TypeAdapter(List[model] if many else model)
+    async def parse(request: Request):
+        body = await request.body()
+        content_type = request.headers.get("content-type")
+        try:
+            if content_type and not is_json_content_type(content_type):
+                # Like FastAPI, validate the raw bytes so non-JSON bodies fail with a 422
+                return adapter.validate_python(body)
+            return adapter.validate_json(body)
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+    return parse
+
+def json_body_openapi(model, many=False):
+    schema = model.model_json_schema()
+    return {
+        "requestBody": {
+            "content": {"application/json": {"schema": {"type": "array", "items": schema} if many else schema}},
+            "required": True,
+        }
+    }
 
 # API Routes
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "HRMS Lite API"}
 
 # Employee endpoints
-@app.post("/api/employees", response_model=EmployeeResponse, status_code=201)
-def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
-    # Check for duplicate employee_id
-    existing = db.query(Employee).filter(Employee.employee_id == employee.employee_id).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Employee ID already exists")
-    
-    # Check for duplicate email
-    existing_email = db.query(Employee).filter(Employee.email == employee.email).first()
-    if existing_email:
-        raise HTTPException(status_code=400, detail="Email already exists")
-    
+@app.post("/api/employees", response_model=EmployeeResponse, status_code=201,
+          openapi_extra=json_body_openapi(EmployeeCreate))
+async def create_employee(employee: EmployeeCreate = Depends(json_body(EmployeeCreate)), db: AsyncSession = Depends(get_db)):
     db_employee = Employee(
         employee_id=employee.employee_id,
         full_name=employee.full_name,
@@ -155,58 +411,94 @@ def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
         department=employee.department
     )
     db.add(db_employee)
-    db.commit()
-    db.refresh(db_employee)
+    # Duplicate employee_id / email are rejected by the unique constraints. The violated one is
+    # read from the driver message, which names the column on SQLite
+    # ("UNIQUE constraint failed: employees.employee_id" / "employees.email") and the index or
+    # constraint on PostgreSQL ("ix_employees_employee_id" / "employees_email_key").
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        message = str(e.orig)
+        if "employees.employee_id" in message or "ix_employees_employee_id" in message:
+            raise HTTPException(status_code=400, detail="Employee ID already exists")
+        if "employees.email" in message or "employees_email_key" in message:
+            raise HTTPException(status_code=400, detail="Email already exists")
+        raise
+    await update_stats_counters(employees=1)
+    await invalidate_cache("employees", "stats")
     return db_employee
 
-@app.get("/api/employees", response_model=List[EmployeeResponse])
-def get_employees(db: Session = Depends(get_db)):
-    employees = db.query(Employee).all()
-    return employees
+# List endpoints return an ORJSONResponse directly so FastAPI skips jsonable_encoder;
+# response models are kept for the OpenAPI docs only
+@app.get("/api/employees", response_model=None, responses={200: {"model": List[EmployeeResponse]}})
+@cache(expire=60, namespace="employees", coder=JSONResponseCoder)
+async def get_employees(db: AsyncSession = Depends(get_db)):
+    employees = (await db.execute(
+        select(Employee.id, Employee.employee_id, Employee.full_name, Employee.email, Employee.department)
+    )).mappings().all()
+    return ORJSONResponse([dict(employee) for employee in employees])
 
 @app.get("/api/employees/{employee_id}", response_model=EmployeeResponse)
-def get_employee(employee_id: int, db: Session = Depends(get_db)):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+async def get_employee(employee_id: int, db: AsyncSession = Depends(get_db)):
+    employee = (await db.execute(
+        select(Employee).where(Employee.id == employee_id)
+    )).scalar_one_or_none()
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     return employee
 
 @app.delete("/api/employees/{employee_id}", status_code=204)
-def delete_employee(employee_id: int, db: Session = Depends(get_db)):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+async def delete_employee(employee_id: int, db: AsyncSession = Depends(get_db)):
+    employee = (await db.execute(
+        select(Employee).where(Employee.id == employee_id)
+    )).scalar_one_or_none()
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    # Delete associated attendance records
-    db.query(Attendance).filter(Attendance.employee_id == employee_id).delete()
-    db.delete(employee)
-    db.commit()
+    # Delete associated attendance records; the returned statuses drive the stats counter delta
+    deleted_statuses = (await db.execute(
+        delete(Attendance).where(Attendance.employee_id == employee_id).returning(Attendance.status)
+    )).scalars().all()
+    await db.delete(employee)
+    await db.commit()
+    await update_stats_counters(
+        employees=-1,
+        attendance=-len(deleted_statuses),
+        present_by_employee={employee_id: -deleted_statuses.count("Present")},
+        removed_employee_id=employee_id
+    )
+    await invalidate_cache("employees", "stats")
     return None
 
 # Attendance endpoints
-@app.post("/api/attendance", response_model=AttendanceResponse, status_code=201)
-def create_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db)):
+@app.post("/api/attendance", response_model=AttendanceResponse, status_code=201,
+          openapi_extra=json_body_openapi(AttendanceCreate))
+async def create_attendance(attendance: AttendanceCreate = Depends(json_body(AttendanceCreate)), db: AsyncSession = Depends(get_db)):
     # Check if employee exists
-    employee = db.query(Employee).filter(Employee.id == attendance.employee_id).first()
+    employee = (await db.execute(
+        select(Employee).where(Employee.id == attendance.employee_id)
+    )).scalar_one_or_none()
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    # Check for duplicate attendance on same date
-    existing = db.query(Attendance).filter(
-        Attendance.employee_id == attendance.employee_id,
-        Attendance.date == attendance.date
-    ).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Attendance already marked for this date")
-    
     db_attendance = Attendance(
         employee_id=attendance.employee_id,
         date=attendance.date,
         status=attendance.status
     )
     db.add(db_attendance)
-    db.commit()
-    db.refresh(db_attendance)
+    # Duplicate attendance on same date is rejected by uq_att_emp_date
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Attendance already marked for this date")
+    await update_stats_counters(
+        attendance=1,
+        present_by_employee={attendance.employee_id: 1} if attendance.status == "Present" else None
+    )
+    await invalidate_cache("stats")
     
     # Include employee info in response
     response = AttendanceResponse(
@@ -219,75 +511,130 @@ def create_attendance(attendance: AttendanceCreate, db: Session = Depends(get_db
     )
     return response
 
-@app.get("/api/attendance", response_model=List[AttendanceResponse])
-def get_attendance(employee_id: Optional[int] = None, db: Session = Depends(get_db)):
-    query = db.query(Attendance)
+@app.post("/api/attendance/bulk", status_code=201,
+          openapi_extra=json_body_openapi(AttendanceCreate, many=True))
+async def create_attendance_bulk(attendance: List[AttendanceCreate] = Depends(json_body(AttendanceCreate, many=True)), db: AsyncSession = Depends(get_db)):
+    if not attendance:
+        return {"created": 0}
+    
+    # Check that every referenced employee exists in one query
+    employee_ids = {record.employee_id for record in attendance}
+    found_ids = set((await db.execute(
+        select(Employee.id).where(Employee.id.in_(employee_ids))
+    )).scalars().all())
+    if employee_ids - found_ids:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    
+    # Insert all rows in a single transaction
+    try:
+        await db.execute(insert(Attendance), [record.model_dump() for record in attendance])
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Attendance already marked for this date")
+    present_by_employee = {}
+    for record in attendance:
+        if record.status == "Present":
+            present_by_employee[record.employee_id] = present_by_employee.get(record.employee_id, 0) + 1
+    await update_stats_counters(attendance=len(attendance), present_by_employee=present_by_employee)
+    await invalidate_cache("stats")
+    return {"created": len(attendance)}
+
+# Streamed row by row from a server-side cursor; too large to cache as a whole
+@app.get("/api/attendance", response_model=None, responses={200: {"model": List[AttendanceResponse]}})
+async def get_attendance(employee_id: Optional[int] = None):
+    # Include employee info in the same query via JOIN
+    query = select(
+        Attendance.id,
+        Attendance.employee_id,
+        Attendance.date,
+        Attendance.status,
+        Employee.full_name.label("employee_name"),
+        Employee.employee_id.label("employee_employee_id")
+    ).outerjoin(Employee, Employee.id == Attendance.employee_id)
     if employee_id:
-        query = query.filter(Attendance.employee_id == employee_id)
+        query = query.where(Attendance.employee_id == employee_id)
+    query = query.order_by(Attendance.date.desc()).execution_options(yield_per=1000)
     
-    attendance_records = query.order_by(Attendance.date.desc()).all()
+    # The generator owns its session: get_db's session is closed before the body is streamed
+    async def stream_records():
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query)
+            yield b"["
+            first = True
+            async for record in result.mappings():
+                yield (b"" if first else b",") + orjson.dumps(dict(record))
+                first = False
+            yield b"]"
     
-    # Include employee info
-    result = []
-    for record in attendance_records:
-        employee = db.query(Employee).filter(Employee.id == record.employee_id).first()
-        result.append(AttendanceResponse(
-            id=record.id,
-            employee_id=record.employee_id,
-            date=record.date,
-            status=record.status,
-            employee_name=employee.full_name if employee else None,
-            employee_employee_id=employee.employee_id if employee else None
-        ))
-    return result
-
-@app.get("/api/attendance/employee/{employee_id}", response_model=List[AttendanceResponse])
-def get_employee_attendance(employee_id: int, db: Session = Depends(get_db)):
-    employee = db.query(Employee).filter(Employee.id == employee_id).first()
+    return StreamingResponse(stream_records(), media_type="application/json")
+
+@app.get("/api/attendance/employee/{employee_id}", response_model=None, responses={200: {"model": List[AttendanceResponse]}})
+async def get_employee_attendance(employee_id: int, db: AsyncSession = Depends(get_db)):
+    employee = (await db.execute(
+        select(Employee).where(Employee.id == employee_id)
+    )).scalar_one_or_none()
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    attendance_records = db.query(Attendance).filter(
-        Attendance.employee_id == employee_id
-    ).order_by(Attendance.date.desc()).all()
+    attendance_records = (await db.execute(
+        select(Attendance).where(
+            Attendance.employee_id == employee_id
+        ).order_by(Attendance.date.desc())
+    )).scalars().all()
     
-    result = []
-    for record in attendance_records:
-        result.append(AttendanceResponse(
-            id=record.id,
-            employee_id=record.employee_id,
-            date=record.date,
-            status=record.status,
-            employee_name=employee.full_name,
-            employee_employee_id=employee.employee_id
-        ))
-    return result
+    return ORJSONResponse([
+        {
+            "id": record.id,
+            "employee_id": record.employee_id,
+            "date": record.date,
+            "status": record.status,
+            "employee_name": employee.full_name,
+            "employee_employee_id": employee.employee_id
+        }
+        for record in attendance_records
+    ])
 
 # Bonus: Dashboard stats
-@app.get("/api/stats")
-def get_stats(db: Session = Depends(get_db)):
-    total_employees = db.query(Employee).count()
-    total_attendance = db.query(Attendance).count()
-    present_count = db.query(Attendance).filter(Attendance.status == "Present").count()
+async def count_stats(db):
+    total_employees, total_attendance, present_count = (await db.execute(
+        select(
+            select(func.count(Employee.id)).scalar_subquery(),
+            select(func.count(Attendance.id)).scalar_subquery(),
+            select(func.count(Attendance.id)).where(Attendance.status == "Present").scalar_subquery()
+        )
+    )).one()
+    
+    # Get present days per employee in a single GROUP BY
+    present_by_employee = dict((await db.execute(
+        select(Attendance.employee_id, func.count(Attendance.id))
+        .where(Attendance.status == "Present")
+        .group_by(Attendance.employee_id)
+    )).all())
+    return total_employees, total_attendance, present_count, present_by_employee
+
+@app.get("/api/stats", response_model=None)
+@cache(expire=30, namespace="stats", coder=JSONResponseCoder)
+async def get_stats(db: AsyncSession = Depends(get_db)):
+    # O(1) reads from the Redis counters maintained on every write, SQL when unavailable
+    stats = await read_stats_counters()
+    if stats is None:
+        stats = await seed_stats_counters(db) if redis_client is not None else await count_stats(db)
+    total_employees, total_attendance, present_count, present_by_employee = stats
     
-    # Get present days per employee
-    employees = db.query(Employee).all()
-    employee_stats = []
-    for emp in employees:
-        present_days = db.query(Attendance).filter(
-            Attendance.employee_id == emp.id,
-            Attendance.status == "Present"
-        ).count()
-        employee_stats.append({
+    employees = (await db.execute(select(Employee.id, Employee.employee_id, Employee.full_name))).all()
+    employee_stats = [
+        {
             "employee_id": emp.employee_id,
             "employee_name": emp.full_name,
-            "present_days": present_days
-        })
+            "present_days": present_by_employee.get(emp.id, 0)
+        }
+        for emp in employees
+    ]
     
-    return {
+    return ORJSONResponse({
         "total_employees": total_employees,
         "total_attendance_records": total_attendance,
         "total_present": present_count,
         "employee_stats": employee_stats
-    }
-
+    })
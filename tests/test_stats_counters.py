@@ -0,0 +1,67 @@
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakeredis
+from fastapi.testclient import TestClient
+
+import main
+
+NO_CACHE = {"Cache-Control": "no-cache"}
+
+
+def count_stats():
+    async def run():
+        async with main.AsyncSessionLocal() as db:
+            return await main.count_stats(db)
+    return run
+
+
+def add_employee(client, n):
+    resp = client.post("/api/employees", json={
+        "employee_id": f"E{n}",
+        "full_name": f"Employee {n}",
+        "email": f"e{n}@example.com",
+        "department": "Engineering",
+    })
+    assert resp.status_code == 201, resp.text
+    return resp.json()["id"]
+
+
+def add_attendance(client, emp_id, day):
+    resp = client.post("/api/attendance", json={
+        "employee_id": emp_id,
+        "date": f"2024-01-{day:02d}",
+        "status": "Present",
+    })
+    assert resp.status_code == 201, resp.text
+
+
+def test_counters_reseed_after_flush():
+    server = fakeredis.FakeServer()
+    main.redis_client = fakeredis.FakeAsyncRedis(server=server)
+    sync_redis = fakeredis.FakeRedis(server=server)
+    with TestClient(main.app) as client:
+        ids = [add_employee(client, n) for n in range(1, 6)]
+        for day, emp_id in enumerate(ids, start=1):
+            add_attendance(client, emp_id, day)
+
+        # Increments after a flush must not rebuild the hash from deltas alone
+        sync_redis.flushdb()
+        emp_id = add_employee(client, 6)
+        add_attendance(client, emp_id, 6)
+
+        stats = client.get("/api/stats", headers=NO_CACHE).json()
+        total_employees, total_attendance, present_count, _ = client.portal.call(count_stats())
+        assert (total_employees, total_attendance, present_count) == (6, 6, 6)
+        assert stats["total_employees"] == total_employees
+        assert stats["total_attendance_records"] == total_attendance
+        assert stats["total_present"] == present_count
+
+        # Reseeded, later writes are counted again
+        add_attendance(client, ids[0], 7)
+        stats = client.get("/api/stats", headers=NO_CACHE).json()
+        assert stats["total_attendance_records"] == 7
+        assert stats["total_present"] == 7